@@ -0,0 +1,37 @@
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+@lru_cache(maxsize=1)
+def get_redis():
+    """Shared asyncio Redis client, or ``None`` when ``REDIS_URL`` is unset and caching is disabled."""
+    if not settings.redis_url:
+        return None
+    from redis.asyncio import Redis
+
+    return Redis.from_url(settings.redis_url)
+
+
+async def cache_get(key: str) -> Optional[bytes]:
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(key)
+    except Exception:  # a cache outage must never fail the request
+        return None
+
+
+async def cache_set(key: str, value: bytes, ttl_seconds: int) -> None:
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.set(key, value, ex=ttl_seconds)
+    except Exception:
+        pass
+
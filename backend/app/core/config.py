@@ -1,7 +1,7 @@
-from functools import lru_cache
-from typing import Literal
+from functools import cached_property, lru_cache
+from typing import Literal, Optional
 
-from pydantic import Field
+from pydantic import Field, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,6 +11,7 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",  # Allow extra fields to be ignored instead of raising validation errors
+        frozen=True,
     )
 
     app_name: str = Field(default="Oilseed Hedging Backend")
@@ -20,6 +21,17 @@ class Settings(BaseSettings):
     database_url: str = Field(
         alias="DATABASE_URL",
     )
+    # Async engine: authentication and the contract, listing and notification routes.
+    db_pool_size: int = Field(default=20)
+    db_max_overflow: int = Field(default=10)
+    # Sync engine: only signup/login, listing creation, admin and the price feed. Per worker the two engines
+    # together open at most 40 connections, which keeps two workers under Postgres' default max_connections.
+    db_sync_pool_size: int = Field(default=5)
+    db_sync_max_overflow: int = Field(default=5)
+    db_pool_timeout: int = Field(default=30)
+    db_pool_recycle: int = Field(default=1800)
+    # Server-side cap on any single statement, so a stuck query frees its pooled connection. 0 disables it.
+    db_statement_timeout_ms: int = Field(default=30000)
     secret_key: str = Field(
         default="super-secret-development-key",
         alias="JWT_SECRET_KEY",
@@ -31,9 +43,13 @@ class Settings(BaseSettings):
     cors_origins: str = Field(default="http://localhost:3000,http://127.0.0.1:3000")
     media_root: str = Field(default="./storage")
     price_feed_secret: str = Field(default="secret-token", alias="PRICE_FEED_SECRET")
+    redis_url: Optional[str] = Field(default=None, alias="REDIS_URL")
+    contract_timeline_ttl_seconds: int = Field(default=300)
 
-    def allowed_origins(self) -> list[str]:
-        return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
+    @computed_field
+    @cached_property
+    def allowed_origins(self) -> frozenset[str]:
+        return frozenset(origin.strip() for origin in self.cors_origins.split(",") if origin.strip())
 
 
 @lru_cache(maxsize=1)
@@ -0,0 +1,16 @@
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.types import Receive, Scope, Send
+
+
+class BrowserCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that passes machine-to-machine and static routes straight through."""
+
+    def __init__(self, app, skip_prefixes: tuple[str, ...] = (), **kwargs) -> None:
+        super().__init__(app, **kwargs)
+        self.skip_prefixes = skip_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(self.skip_prefixes):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
@@ -6,10 +8,51 @@ from app.core.config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, pool_pre_ping=True, future=True)
+# DATABASE_URL names the sync driver; the async engine swaps in the asyncio driver for the same database.
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def _connect_args(drivername: str) -> dict:
+    """Per-connection Postgres settings, spelled the way each driver accepts them."""
+    timeout = settings.db_statement_timeout_ms
+    if not timeout or not drivername.startswith("postgresql"):
+        return {}
+    if drivername.endswith("+asyncpg"):
+        return {"server_settings": {"statement_timeout": str(timeout)}}
+    return {"options": f"-c statement_timeout={timeout}"}
+
+
+_url = make_url(settings.database_url)
+engine = create_engine(
+    _url,
+    pool_size=settings.db_sync_pool_size,
+    max_overflow=settings.db_sync_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=True,
+    insertmanyvalues_page_size=1000,
+    connect_args=_connect_args(_url.drivername),
+    future=True,
+)
 SessionLocal = scoped_session(
     sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
 )
+
+_async_url = _url.set(drivername=_ASYNC_DRIVERS.get(_url.drivername, _url.drivername))
+async_engine = create_async_engine(
+    _async_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=True,
+    connect_args=_connect_args(_async_url.drivername),
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -18,4 +61,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
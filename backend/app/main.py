@@ -1,21 +1,44 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import get_settings
-from app.core.db import Base, engine
+from app.core.cors import BrowserCORSMiddleware
+from app.core.db import Base, async_engine, engine
 from app.models import audit_log, contract, dispute, listing, notification, price_history, user
 from app.routers import admin_router, auth_router, contract_router, listing_router, notification_router, webhook_router
 
 settings = get_settings()
 
-Base.metadata.create_all(bind=engine)
+# Production schemas are managed out-of-band; only auto-create tables for local/test databases.
+if settings.environment in {"development", "test"}:
+    Base.metadata.create_all(bind=engine, checkfirst=True)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    from app.utils.security import get_password_hash
+
+    # Check out the whole async pool concurrently so workers pay the connect/TLS cost before the first request.
+    connections = await asyncio.gather(*(async_engine.connect().start() for _ in range(settings.db_pool_size)))
+    await asyncio.gather(*(connection.close() for connection in connections))
+    # Force passlib to resolve and load the argon2 backend now rather than on the first signup/login.
+    await run_in_threadpool(get_password_hash, "warmup")
+    yield
+    await async_engine.dispose()
+
 
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, lifespan=lifespan, default_response_class=ORJSONResponse)
 
+# The price-feed webhook and /media are never fetched cross-origin by the browser app.
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.allowed_origins(),
+    BrowserCORSMiddleware,
+    skip_prefixes=("/webhook", "/media"),
+    allow_origins=settings.allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -33,4 +56,4 @@ app.include_router(admin_router.router, prefix="/admin", tags=["Admin"])
 async def health_check():
     return {"status": "healthy", "app": settings.app_name}
 
-app.mount("/media", StaticFiles(directory=settings.media_root), name="media")
\ No newline at end of file
+app.mount("/media", StaticFiles(directory=settings.media_root), name="media")
@@ -1,5 +1,6 @@
 from enum import Enum as PyEnum
-from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Integer, Numeric, String, Text, func
+from sqlalchemy import BigInteger, Column, DateTime, Enum as SQLEnum, Float, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -16,16 +17,24 @@ class ContractStatus(str, PyEnum):
 
 class Contract(Base):
     __tablename__ = "contracts"
+    # Fetch server-generated created_at/updated_at via INSERT ... RETURNING instead of a later SELECT.
+    __mapper_args__ = {"eager_defaults": True}
+    # "My contracts" filters on either party and sorts newest first; these also serve plain FK lookups.
+    __table_args__ = (
+        Index("ix_contracts_buyer_created", "buyer_id", "created_at"),
+        Index("ix_contracts_seller_created", "seller_id", "created_at"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     listing_id = Column(Integer, ForeignKey("listings.id"), nullable=False, index=True)
-    buyer_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    seller_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    buyer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    seller_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     qty_kg = Column(Float, nullable=False)
-    offer_price_per_kg = Column(Numeric(10, 2), nullable=False)
+    # Stored in paise so reads and aggregates stay on int8 instead of boxing Decimals.
+    offer_price_paise = Column(BigInteger, nullable=False)
     status = Column(
-        Enum("draft", "offered", "accepted", "awaiting_settlement", "completed", "disputed", name="contract_status"), 
-        nullable=False, 
-        default="offered"
+        SQLEnum(ContractStatus, name="contract_status"),
+        nullable=False,
+        default=ContractStatus.offered,
     )
     expiry_date = Column(DateTime(timezone=True))
     escrow_tx = Column(String)
@@ -38,4 +47,17 @@ class Contract(Base):
     listing = relationship("Listing", back_populates="contracts")
     buyer = relationship("User", foreign_keys=[buyer_id], back_populates="buyer_contracts")
     seller = relationship("User", foreign_keys=[seller_id], back_populates="seller_contracts")
-    disputes = relationship("Dispute", back_populates="contract", cascade="all,delete-orphan")
\ No newline at end of file
+    disputes = relationship("Dispute", back_populates="contract", cascade="all,delete-orphan")
+
+    @hybrid_property
+    def offer_price_per_kg(self) -> float:
+        return self.offer_price_paise / 100
+
+    @offer_price_per_kg.inplace.setter
+    def _offer_price_per_kg_setter(self, value) -> None:
+        self.offer_price_paise = round(value * 100)
+
+    @offer_price_per_kg.inplace.expression
+    @classmethod
+    def _offer_price_per_kg_expression(cls):
+        return cls.offer_price_paise / 100.0
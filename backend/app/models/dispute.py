@@ -1,6 +1,7 @@
 from enum import Enum
 
-from sqlalchemy import JSON, Column, DateTime, Enum as SQLEnum, ForeignKey, Integer, String, func
+from sqlalchemy import Column, DateTime, Enum as SQLEnum, ForeignKey, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -18,7 +19,7 @@ class Dispute(Base):
     contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False, index=True)
     raised_by_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     reason = Column(String, nullable=False)
-    evidence_urls = Column(JSON, default=list)
+    evidence_urls = Column(JSONB, default=list)
     status = Column(SQLEnum(DisputeStatus, name="dispute_status"), default=DisputeStatus.open, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
@@ -1,6 +1,7 @@
 from enum import Enum
 
-from sqlalchemy import JSON, Column, DateTime, Enum as SQLEnum, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DDL, JSON, BigInteger, Column, DateTime, Enum as SQLEnum, Float, ForeignKey, Index, Integer, String, Text, case, cast, event, func, literal, text
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -14,18 +15,38 @@ class ListingStatus(str, Enum):
 
 class Listing(Base):
     __tablename__ = "listings"
+    # Fetch server-generated created_at/updated_at via INSERT ... RETURNING instead of a later SELECT.
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # The marketplace feed only ever shows active listings, newest first with id as the keyset tiebreak.
+        Index("ix_listings_active_created", "created_at", "id", postgresql_where=text("status = 'active'")),
+        # Commodity filter compares lower(commodity); an expression index lets it seek instead of scan.
+        Index(
+            "ix_listings_active_commodity",
+            text("lower(commodity)"),
+            "created_at",
+            postgresql_where=text("status = 'active'"),
+        ),
+        # Trigram GIN index so the substring ILIKE location search can use an index despite the leading %.
+        Index(
+            "ix_listings_location_trgm",
+            "location",
+            postgresql_using="gin",
+            postgresql_ops={"location": "gin_trgm_ops"},
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     seller_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     commodity = Column(String, nullable=False)
     variety = Column(String)
     qty_kg = Column(Float, nullable=False)
-    price_per_kg = Column(Float, nullable=False)
+    price_paise = Column(BigInteger, nullable=False)
     moisture_pct = Column(Float)
     quality_notes = Column(Text)
     photos = Column(JSON, default=list)
     location = Column(String)
     status = Column(
-        SQLEnum("active", "closed", "draft", name="listing_status"), nullable=False, default="active"
+        SQLEnum(ListingStatus, name="listing_status"), nullable=False, default=ListingStatus.active
     )
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(
@@ -33,4 +54,38 @@ class Listing(Base):
     )
 
     seller = relationship("User", back_populates="listings")
-    contracts = relationship("Contract", back_populates="listing", cascade="all,delete")
\ No newline at end of file
+    contracts = relationship("Contract", back_populates="listing", cascade="all,delete")
+
+    @hybrid_property
+    def price_per_kg(self) -> float:
+        return self.price_paise / 100
+
+    @price_per_kg.inplace.setter
+    def _price_per_kg_setter(self, value) -> None:
+        self.price_paise = round(value * 100)
+
+    @price_per_kg.inplace.expression
+    @classmethod
+    def _price_per_kg_expression(cls):
+        return cls.price_paise / 100.0
+
+    @hybrid_property
+    def seller_alias(self) -> str:
+        return f"Farmer #{self.seller_id:03d}"
+
+    @seller_alias.inplace.expression
+    @classmethod
+    def _seller_alias_expression(cls):
+        # lpad() truncates longer input, so only pad ids that are shorter than three digits.
+        seller_id = cast(cls.seller_id, String)
+        return literal("Farmer #", String) + case(
+            (cls.seller_id < 1000, func.lpad(seller_id, 3, "0")), else_=seller_id
+        )
+
+
+# gin_trgm_ops comes from pg_trgm, which has to exist before create_all builds ix_listings_location_trgm.
+event.listen(
+    Listing.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
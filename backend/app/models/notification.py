@@ -1,4 +1,5 @@
-from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -6,10 +7,16 @@ from app.core.db import Base
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Unread notifications are a small, hot subset: serves the unread count and unread-only feed.
+        Index("ix_notif_unread", "user_id", "created_at", postgresql_where=text("read = false")),
+        # Full feed: user_id equality then newest-first, so paging walks the index backwards without a sort.
+        Index("ix_notif_user_created", "user_id", "created_at"),
+    )
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     type = Column(String, nullable=False)
-    payload = Column(JSON, nullable=False)
+    payload = Column(JSONB, nullable=False)
     read = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
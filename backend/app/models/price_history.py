@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Date, Float, Integer, String
+from sqlalchemy import Column, Date, Float, Integer, String, UniqueConstraint
 
 from app.core.db import Base
 
 
 class PriceHistory(Base):
     __tablename__ = "price_history"
+    # One price per commodity per day; also the conflict target for the price feed upsert.
+    __table_args__ = (UniqueConstraint("commodity", "recorded_on", name="uq_price_history_commodity_recorded_on"),)
     id = Column(Integer, primary_key=True, index=True)
     commodity = Column(String, nullable=False)
     price_per_kg = Column(Float, nullable=False)
@@ -1,12 +1,14 @@
 from sqlalchemy import Column, DateTime, Integer, String, func
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.core.db import Base
 
 
 class User(Base):
     __tablename__ = "users"
+    # Fetch the server-generated created_at via INSERT ... RETURNING instead of a later SELECT.
+    __mapper_args__ = {"eager_defaults": True}
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -15,7 +17,8 @@ class User(Base):
     kyc_status = Column(String, nullable=False, default="pending")
     kyc_document_url = Column(String)
     wallet_address = Column(String)
-    profile_data = Column(JSONB, default=dict)
+    # Deferred: token checks and relationship loads only need the scalar columns.
+    profile_data = deferred(Column(JSONB, default=dict))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     listings = relationship("Listing", back_populates="seller", cascade="all,delete")
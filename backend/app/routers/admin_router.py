@@ -1,7 +1,9 @@
-from typing import List
+from datetime import datetime
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, raiseload
 
 from app.core.db import get_db
 from app.models.audit_log import AuditLog
@@ -17,8 +19,8 @@ class AuditLogResponse(ORMBase):
     entity_id: int
     action: str
     actor_id: int | None
-    payload: dict
-    timestamp: str
+    payload: Any
+    timestamp: datetime
 
 
 @router.get("/audit/{contract_id}", response_model=List[AuditLogResponse])
@@ -26,34 +28,40 @@ def get_contract_audit_logs(
     contract_id: int,
     db: Session = Depends(get_db),
     current_user=Depends(require_role("admin")),
-) -> List[AuditLogResponse]:
-    """Admin only - returns append-only logs for a contract."""
+    after_ts: Optional[datetime] = Query(default=None),
+    after_id: Optional[int] = Query(default=None),
+    limit: int = Query(default=200, ge=1, le=1000),
+) -> List[AuditLog]:
+    """Admin only - returns append-only logs for a contract.
+
+    Results are keyset-paginated: pass the ``timestamp`` and ``id`` of the last
+    row received as ``after_ts``/``after_id`` to fetch the next page.
+    """
     
-    logs = (
+    query = (
         db.query(AuditLog)
+        .options(raiseload("*"))
         .filter(
             AuditLog.entity_type == "contract",
             AuditLog.entity_id == contract_id
         )
-        .order_by(AuditLog.timestamp.asc())
-        .all()
     )
+    if after_ts is not None:
+        if after_id is None:
+            query = query.filter(AuditLog.timestamp > after_ts)
+        else:
+            query = query.filter(
+                or_(
+                    AuditLog.timestamp > after_ts,
+                    and_(AuditLog.timestamp == after_ts, AuditLog.id > after_id),
+                )
+            )
     
-    if not logs:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No audit logs found for this contract"
-        )
+    # Returned as ORM rows; FastAPI builds AuditLogResponse from attributes in a single pydantic-core pass.
+    logs = (
+        query.order_by(AuditLog.timestamp.asc(), AuditLog.id.asc())
+        .limit(limit)
+        .all()
+    )
     
-    return [
-        AuditLogResponse(
-            id=log.id,
-            entity_type=log.entity_type,
-            entity_id=log.entity_id,
-            action=log.action,
-            actor_id=log.actor_id,
-            payload=log.payload or {},
-            timestamp=log.timestamp.isoformat()
-        )
-        for log in logs
-    ]
+    return logs
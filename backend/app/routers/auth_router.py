@@ -1,21 +1,21 @@
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session, undefer
 
 from app.core.db import get_db
 from app.models.user import User
 from app.schemas.auth import LoginRequest, LoginResponse, SignupRequest, TokenResponse
 from app.schemas.user import UserResponse
-from app.utils.security import create_access_token, get_password_hash, verify_password
+from app.utils.security import create_access_token, get_password_hash, verify_and_update_password
 
 router = APIRouter()
 
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def signup(payload: SignupRequest, db: Session = Depends(get_db)) -> UserResponse:
-    existing = db.query(User).filter(User.email == payload.email).first()
-    if existing:
+    if db.scalar(select(exists().where(User.email == payload.email))):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
     user = User(
@@ -26,15 +26,24 @@ def signup(payload: SignupRequest, db: Session = Depends(get_db)) -> UserRespons
     )
     db.add(user)
     db.commit()
-    db.refresh(user)
     return UserResponse.model_validate(user)
 
 
 @router.post("/login", response_model=LoginResponse)
 def login(payload: LoginRequest, db: Session = Depends(get_db)) -> LoginResponse:
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+    user = (
+        db.execute(select(User).options(undefer(User.profile_data)).where(User.email == payload.email))
+        .scalars()
+        .first()
+    )
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    verified, new_hash = verify_and_update_password(payload.password, user.password_hash)
+    if not verified:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if new_hash:
+        user.password_hash = new_hash
+        db.commit()
 
     expires_delta = timedelta(minutes=60 * 24)
     access_token = create_access_token({"sub": str(user.id), "role": user.role}, expires_delta=expires_delta)
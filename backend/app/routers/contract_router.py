@@ -1,11 +1,15 @@
-from datetime import datetime
-from typing import List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session, joinedload
-
-from app.core.db import get_db
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import Row, bindparam, func, insert, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, raiseload
+
+from app.core.cache import cache_get, cache_set
+from app.core.config import get_settings
+from app.core.db import AsyncSessionLocal, get_async_db
 from app.models.audit_log import AuditLog
 from app.models.contract import Contract, ContractStatus
 from app.models.dispute import Dispute, DisputeStatus
@@ -20,68 +24,91 @@ from app.schemas.contract import (
     ContractEvent,
     ContractListResponse,
     ContractResponse,
+    ContractStatsResponse,
 )
-from app.services.audit import log_action
-from app.services.notification import create_notification
+from app.services.audit import bulk_log_audit, log_action
+from app.services.notification import deliver_notifications
 from app.utils.security import get_current_user, require_role
 
 router = APIRouter()
+settings = get_settings()
+_timeline_adapter = TypeAdapter(List[ContractEvent])
+# Validates a whole page of rows in one pydantic-core call instead of one model_validate per row.
+_contract_list_adapter = TypeAdapter(List[ContractResponse])
+# Upper bound on offers per bulk request, so one call cannot grow a single transaction without limit.
+_MAX_BULK_CONTRACTS = 100
+
+
+# Plain column rows for list views: skips ORM identity-map bookkeeping and instance construction.
+# listing_ref/counterparty_name are derived by ContractResponse from these columns.
+_CONTRACT_LIST_COLUMNS = (
+    Contract.id,
+    Contract.listing_id,
+    Contract.buyer_id,
+    Contract.seller_id,
+    Contract.qty_kg,
+    Contract.offer_price_per_kg.label("offer_price_per_kg"),
+    Contract.status,
+    Contract.expiry_date,
+    Contract.escrow_tx,
+    Contract.created_at,
+    Contract.updated_at,
+)
 
+_STATUS_BY_VALUE = {member.value: member for member in ContractStatus}
 
-def _contract_to_response(contract: Contract, current_user: User) -> ContractResponse:
-    listing_ref = f"Listing #{contract.listing_id:04d}"
-    if current_user.id == contract.buyer_id:
-        counterparty_name = f"Farmer #{contract.seller_id:03d}"
-    elif current_user.id == contract.seller_id:
-        counterparty_name = f"Buyer #{contract.buyer_id:03d}"
-    else:
-        counterparty_name = None
-
-    data = jsonable_encoder(contract, exclude={"listing", "buyer", "seller", "disputes"})
-    data.update(
-        {
-            "listing_ref": listing_ref,
-            "counterparty_name": counterparty_name,
-        }
-    )
-    return ContractResponse(**data)
+# The hot lookups have a fixed shape, so build them once at import and pass values as bound params.
+_CONTRACT_BY_ID = select(Contract).where(Contract.id == bindparam("contract_id"))
+# The detail response only reads contract columns; fail loudly if a relationship ever gets lazy-loaded.
+_CONTRACT_DETAIL = _CONTRACT_BY_ID.options(raiseload("*"))
+_CONTRACTS_FOR_USER = (
+    select(*_CONTRACT_LIST_COLUMNS)
+    .where(or_(Contract.buyer_id == bindparam("user_id"), Contract.seller_id == bindparam("user_id")))
+    .order_by(Contract.created_at.desc())
+)
+# One GROUP BY for every status bucket; each branch of the OR seeks its (party_id, created_at) index.
+_CONTRACT_STATUS_COUNTS = (
+    select(Contract.status, func.count())
+    .where(or_(Contract.buyer_id == bindparam("user_id"), Contract.seller_id == bindparam("user_id")))
+    .group_by(Contract.status)
+)
+_CONTRACT_TIMELINE = (
+    select(AuditLog.actor_id, AuditLog.action, AuditLog.timestamp, AuditLog.payload)
+    .where(AuditLog.entity_type == "contract", AuditLog.entity_id == bindparam("contract_id"))
+    .order_by(AuditLog.timestamp.asc())
+)
+_ACTIVE_LISTING = select(Listing.id, Listing.seller_id, Listing.qty_kg).where(
+    Listing.id == bindparam("listing_id"), Listing.status == ListingStatus.active
+)
 
 
-def _timeline_for_contract(db: Session, contract_id: int) -> List[ContractEvent]:
-    events = (
-        db.query(AuditLog)
-        .filter(AuditLog.entity_type == "contract", AuditLog.entity_id == contract_id)
-        .order_by(AuditLog.timestamp.asc())
-        .all()
-    )
-    timeline: List[ContractEvent] = []
-    for event in events:
-        status_value = event.payload.get("status") if event.payload else None
-        status = ContractStatus(status_value) if status_value else ContractStatus.offered
-        timeline.append(
-            ContractEvent(
-                status=status,
-                actor_id=event.actor_id,
-                action=event.action,
-                timestamp=event.timestamp,
-                payload=event.payload or {},
-            )
+def _timeline_cache_key(contract: Contract) -> str:
+    # Every transition bumps updated_at in the same commit as its audit row, so a new version gets a new
+    # key; a request that read the timeline before the transition can only refill the superseded key.
+    return f"contract:{contract.id}:timeline:{contract.updated_at.isoformat()}"
+
+
+def _contract_to_response(contract: Contract, current_user: User) -> ContractResponse:
+    return ContractResponse.model_validate(contract, context={"viewer_id": current_user.id})
+
+
+async def _timeline_for_contract(db: AsyncSession, contract_id: int) -> List[ContractEvent]:
+    # Plain column rows: the timeline never needs AuditLog instances or identity-map tracking.
+    result = await db.execute(_CONTRACT_TIMELINE, {"contract_id": contract_id})
+    return [
+        ContractEvent(
+            status=_STATUS_BY_VALUE.get((row.payload or {}).get("status"), ContractStatus.offered),
+            actor_id=row.actor_id,
+            action=row.action,
+            timestamp=row.timestamp,
+            payload=row.payload or {},
         )
-    return timeline
+        for row in result
+    ]
 
 
-@router.post("/", response_model=ContractCreateResponse, status_code=status.HTTP_201_CREATED)
-def create_contract(
-    payload: ContractCreateRequest,
-    db: Session = Depends(get_db),
-    current_user=Depends(require_role("buyer")),
-) -> ContractCreateResponse:
-    listing = (
-        db.query(Listing)
-        .options(joinedload(Listing.seller))
-        .filter(Listing.id == payload.listing_id, Listing.status == ListingStatus.active)
-        .first()
-    )
+def _validate_offer(payload: ContractCreateRequest, listing: Optional[Row], current_user: User) -> int:
+    """Apply the offer rules shared by single and bulk creation; returns the buyer id to record."""
     if not listing:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Listing not available")
     if listing.seller_id == current_user.id:
@@ -95,19 +122,48 @@ def create_contract(
         # allow admins only to set buyer_id explicitly
         if current_user.role != "admin":
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot create offer for another user")
+    return buyer_id
 
-    contract = Contract(
-        listing_id=listing.id,
-        buyer_id=buyer_id,
-        seller_id=listing.seller_id,
-        qty_kg=payload.qty,
-        offer_price_per_kg=payload.offer_price_per_kg,
-        status=ContractStatus.offered,
-        expiry_date=payload.expiry_date,
-    )
-    db.add(contract)
-    db.commit()
-    db.refresh(contract)
+
+@router.post("/", response_model=ContractCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_contract(
+    payload: ContractCreateRequest,
+    background: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(require_role("buyer")),
+) -> ContractCreateResponse:
+    buyer_id = payload.buyer_id or current_user.id
+    contract = None
+    if buyer_id == current_user.id or current_user.role == "admin":
+        # Insert straight from the listing row so the offer checks and the write are one atomic statement.
+        contract_columns = Contract.__table__.c
+        result = await db.execute(
+            insert(Contract)
+            .from_select(
+                ["listing_id", "buyer_id", "seller_id", "qty_kg", "offer_price_paise", "status", "expiry_date"],
+                select(
+                    Listing.id,
+                    literal(buyer_id),
+                    Listing.seller_id,
+                    literal(payload.qty, contract_columns.qty_kg.type),
+                    literal(round(payload.offer_price_per_kg * 100), contract_columns.offer_price_paise.type),
+                    literal(ContractStatus.offered, contract_columns.status.type),
+                    literal(payload.expiry_date, contract_columns.expiry_date.type),
+                ).where(
+                    Listing.id == payload.listing_id,
+                    Listing.status == ListingStatus.active,
+                    Listing.seller_id != current_user.id,
+                    Listing.qty_kg >= payload.qty,
+                ),
+            )
+            .returning(Contract.id, Contract.listing_id, Contract.seller_id, Contract.status, Contract.created_at)
+        )
+        contract = result.first()
+    if contract is None:
+        # Rare path: re-read the listing only to report which rule the offer broke.
+        result = await db.execute(_ACTIVE_LISTING, {"listing_id": payload.listing_id})
+        _validate_offer(payload, result.first(), current_user)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Listing changed, please retry")
 
     log_action(
         db,
@@ -115,83 +171,221 @@ def create_contract(
         entity_id=contract.id,
         action="offer_created",
         actor_id=current_user.id,
-        payload={"status": contract.status, "qty_kg": contract.qty_kg},
+        payload={"status": contract.status, "qty_kg": payload.qty},
     )
 
-    create_notification(
-        db,
-        user_id=listing.seller_id,
-        notification_type="offer-created",
-        payload={"contract_id": contract.id, "listing_id": listing.id},
+    await db.commit()
+    background.add_task(
+        deliver_notifications,
+        [
+            {
+                "user_id": contract.seller_id,
+                "type": "offer-created",
+                "payload": {"contract_id": contract.id, "listing_id": contract.listing_id},
+            }
+        ],
     )
 
     return ContractCreateResponse(contract_id=contract.id, status=contract.status, created_at=contract.created_at)
 
 
+@router.post("/bulk", response_model=List[ContractCreateResponse], status_code=status.HTTP_201_CREATED)
+async def create_contracts_bulk(
+    background: BackgroundTasks,
+    payload: List[ContractCreateRequest] = Body(max_length=_MAX_BULK_CONTRACTS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(require_role("buyer")),
+) -> List[ContractCreateResponse]:
+    """Create many offers in one transaction; any invalid offer rejects the whole batch."""
+    if not payload:
+        return []
+
+    result = await db.execute(
+        select(Listing.id, Listing.seller_id, Listing.qty_kg).where(
+            Listing.id.in_({item.listing_id for item in payload}), Listing.status == ListingStatus.active
+        )
+    )
+    listings = {row.id: row for row in result}
+
+    contract_rows = []
+    for item in payload:
+        listing = listings.get(item.listing_id)
+        buyer_id = _validate_offer(item, listing, current_user)
+        contract_rows.append(
+            {
+                "listing_id": listing.id,
+                "buyer_id": buyer_id,
+                "seller_id": listing.seller_id,
+                "qty_kg": item.qty,
+                "offer_price_paise": round(item.offer_price_per_kg * 100),
+                "status": ContractStatus.offered,
+                "expiry_date": item.expiry_date,
+            }
+        )
+
+    result = await db.execute(
+        insert(Contract).returning(
+            Contract.id,
+            Contract.listing_id,
+            Contract.seller_id,
+            Contract.qty_kg,
+            Contract.status,
+            Contract.created_at,
+            sort_by_parameter_order=True,
+        ),
+        contract_rows,
+    )
+    created = result.all()
+
+    await bulk_log_audit(
+        db,
+        [
+            {
+                "entity_type": "contract",
+                "entity_id": row.id,
+                "action": "offer_created",
+                "actor_id": current_user.id,
+                "payload": {"status": row.status, "qty_kg": row.qty_kg},
+            }
+            for row in created
+        ],
+    )
+    await db.commit()
+    background.add_task(
+        deliver_notifications,
+        [
+            {
+                "user_id": row.seller_id,
+                "type": "offer-created",
+                "payload": {"contract_id": row.id, "listing_id": row.listing_id},
+            }
+            for row in created
+        ],
+    )
+
+    return [
+        ContractCreateResponse(contract_id=row.id, status=row.status, created_at=row.created_at) for row in created
+    ]
+
+
+async def _stream_contracts(user_id: int, context: dict) -> AsyncIterator[bytes]:
+    # Owns its session: the request-scoped one may be closed before the body finishes streaming.
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(_CONTRACTS_FOR_USER.execution_options(yield_per=200), {"user_id": user_id})
+        async for row in result:
+            yield ContractResponse.model_validate(row, context=context).model_dump_json().encode() + b"\n"
+
+
 @router.get("/", response_model=ContractListResponse)
-def list_contracts(
+async def list_contracts(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
     user_id: Optional[int] = Query(default=None),
-) -> ContractListResponse:
+    stream: bool = Query(default=False, description="Stream one JSON contract per line (NDJSON)"),
+):
     target_user_id = user_id or current_user.id
     if target_user_id != current_user.id and current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to view these contracts")
 
-    contracts = (
-        db.query(Contract)
-        .options(joinedload(Contract.listing))
-        .filter((Contract.buyer_id == target_user_id) | (Contract.seller_id == target_user_id))
-        .order_by(Contract.created_at.desc())
-        .all()
-    )
+    context = {"viewer_id": current_user.id}
+    if stream:
+        return StreamingResponse(_stream_contracts(target_user_id, context), media_type="application/x-ndjson")
 
-    response_items = [_contract_to_response(contract, current_user) for contract in contracts]
+    result = await db.execute(_CONTRACTS_FOR_USER, {"user_id": target_user_id})
+    response_items = _contract_list_adapter.validate_python(result.all(), from_attributes=True, context=context)
     return ContractListResponse(contracts=response_items)
 
 
+@router.get("/stats", response_model=ContractStatsResponse)
+async def contract_stats(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user),
+    user_id: Optional[int] = Query(default=None),
+) -> ContractStatsResponse:
+    """Contract counts per status for a user, with every status present (zero when empty)."""
+    target_user_id = user_id or current_user.id
+    if target_user_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to view these contracts")
+
+    result = await db.execute(_CONTRACT_STATUS_COUNTS, {"user_id": target_user_id})
+    counts = dict.fromkeys(ContractStatus, 0)
+    counts.update({bucket: total for bucket, total in result})
+    return ContractStatsResponse(counts=counts)
+
+
 @router.get("/{contract_id}", response_model=ContractDetailResponse)
-def get_contract_detail(
+async def get_contract_detail(
     contract_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ) -> ContractDetailResponse:
-    contract = (
-        db.query(Contract)
-        .options(joinedload(Contract.listing))
-        .filter(Contract.id == contract_id)
-        .first()
-    )
+    result = await db.execute(_CONTRACT_DETAIL, {"contract_id": contract_id})
+    contract = result.scalars().first()
     if not contract:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contract not found")
 
     if current_user.id not in {contract.buyer_id, contract.seller_id} and current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view contract")
 
+    # Only authorised callers reach the timeline; the cache keeps the hot path to one query.
+    cached_timeline = await cache_get(_timeline_cache_key(contract))
+    if cached_timeline is not None:
+        timeline = _timeline_adapter.validate_json(cached_timeline)
+    else:
+        timeline = await _timeline_for_contract(db, contract_id)
+        await cache_set(
+            _timeline_cache_key(contract),
+            _timeline_adapter.dump_json(timeline),
+            settings.contract_timeline_ttl_seconds,
+        )
+
     response = _contract_to_response(contract, current_user).model_dump()
-    timeline = _timeline_for_contract(db, contract.id)
     response.update({"timeline": timeline})
     return ContractDetailResponse(**response)
 
 
-def _update_contract_status(
-    db: Session,
+_CONFIRMABLE_STATUSES = (ContractStatus.accepted, ContractStatus.awaiting_settlement)
+
+
+async def _set_contract_status(
+    db: AsyncSession, contract_id: int, new_status: ContractStatus, *conditions
+) -> Optional[Contract]:
+    """Compare-and-set the status; returns ``None`` when the row is missing or a condition fails."""
+    # UPDATE ... RETURNING refreshes the identity-mapped Contract in the same round-trip, so no
+    # follow-up SELECT is needed after commit.
+    result = await db.execute(
+        update(Contract)
+        .where(Contract.id == contract_id, *conditions)
+        .values(status=new_status, updated_at=func.now())
+        .returning(Contract)
+    )
+    return result.scalar_one_or_none()
+
+
+def _seller_guard(user: User) -> tuple:
+    return () if user.role == "admin" else (Contract.seller_id == user.id,)
+
+
+async def _load_contract_or_404(db: AsyncSession, contract_id: int) -> Contract:
+    contract = await db.get(Contract, contract_id)
+    if not contract:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contract not found")
+    return contract
+
+
+async def _record_transition(
+    db: AsyncSession,
+    background: BackgroundTasks,
     *,
     contract: Contract,
-    new_status: ContractStatus,
     actor: User,
     action: str,
     notification_user_id: Optional[int] = None,
     notification_type: Optional[str] = None,
     notification_payload: Optional[dict] = None,
-) -> Contract:
-    contract.status = new_status
-    contract.updated_at = datetime.utcnow()
-    db.add(contract)
-    db.commit()
-    db.refresh(contract)
-
+) -> None:
     log_action(
         db,
         entity_type="contract",
@@ -201,27 +395,22 @@ def _update_contract_status(
         payload={"status": contract.status},
     )
 
+    await db.commit()
+
     if notification_user_id and notification_type:
-        create_notification(
-            db,
-            user_id=notification_user_id,
-            notification_type=notification_type,
-            payload=notification_payload or {"contract_id": contract.id},
+        background.add_task(
+            deliver_notifications,
+            [
+                {
+                    "user_id": notification_user_id,
+                    "type": notification_type,
+                    "payload": notification_payload or {"contract_id": contract.id},
+                }
+            ],
         )
 
-    return contract
-
 
-@router.post("/{contract_id}/accept", response_model=ContractResponse)
-def accept_contract(
-    contract_id: int,
-    payload: ContractAcceptRequest,
-    db: Session = Depends(get_db),
-    current_user=Depends(require_role("farmer", "admin")),
-) -> ContractResponse:
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
-    if not contract:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contract not found")
+def _check_accept(contract: Contract, payload: ContractAcceptRequest, current_user: User) -> None:
     if contract.seller_id != current_user.id and current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only seller can accept offer")
     if contract.status != ContractStatus.offered:
@@ -229,10 +418,40 @@ def accept_contract(
     if payload.accepter_id != current_user.id and current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid accepter")
 
-    contract = _update_contract_status(
+
+def _check_confirm(contract: Contract, current_user: User) -> None:
+    if contract.seller_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only seller can confirm delivery")
+    if contract.status not in _CONFIRMABLE_STATUSES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Contract not ready for completion")
+
+
+@router.post("/{contract_id}/accept", response_model=ContractResponse)
+async def accept_contract(
+    contract_id: int,
+    payload: ContractAcceptRequest,
+    background: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(require_role("farmer", "admin")),
+) -> ContractResponse:
+    # Happy path is a single conditional UPDATE; the contract is only SELECTed to explain a refusal.
+    contract = None
+    if payload.accepter_id == current_user.id or current_user.role == "admin":
+        contract = await _set_contract_status(
+            db,
+            contract_id,
+            ContractStatus.accepted,
+            Contract.status == ContractStatus.offered,
+            *_seller_guard(current_user),
+        )
+    if contract is None:
+        _check_accept(await _load_contract_or_404(db, contract_id), payload, current_user)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Contract changed, please retry")
+
+    await _record_transition(
         db,
+        background,
         contract=contract,
-        new_status=ContractStatus.accepted,
         actor=current_user,
         action="offer_accepted",
         notification_user_id=contract.buyer_id,
@@ -243,23 +462,27 @@ def accept_contract(
 
 
 @router.post("/{contract_id}/confirm-delivery", response_model=ContractResponse)
-def confirm_delivery(
+async def confirm_delivery(
     contract_id: int,
-    db: Session = Depends(get_db),
+    background: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(require_role("farmer", "admin")),
 ) -> ContractResponse:
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
-    if not contract:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contract not found")
-    if contract.seller_id != current_user.id and current_user.role != "admin":
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only seller can confirm delivery")
-    if contract.status not in {ContractStatus.accepted, ContractStatus.awaiting_settlement}:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Contract not ready for completion")
+    contract = await _set_contract_status(
+        db,
+        contract_id,
+        ContractStatus.completed,
+        Contract.status.in_(_CONFIRMABLE_STATUSES),
+        *_seller_guard(current_user),
+    )
+    if contract is None:
+        _check_confirm(await _load_contract_or_404(db, contract_id), current_user)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Contract changed, please retry")
 
-    contract = _update_contract_status(
+    await _record_transition(
         db,
+        background,
         contract=contract,
-        new_status=ContractStatus.completed,
         actor=current_user,
         action="delivery_confirmed",
         notification_user_id=contract.buyer_id,
@@ -270,30 +493,52 @@ def confirm_delivery(
 
 
 @router.post("/{contract_id}/raise-dispute", response_model=ContractResponse)
-def raise_dispute(
+async def raise_dispute(
     contract_id: int,
     payload: ContractDisputeRequest,
-    db: Session = Depends(get_db),
+    background: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ) -> ContractResponse:
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
-    if not contract:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contract not found")
-    if current_user.id not in {contract.buyer_id, contract.seller_id}:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a party to this contract")
-
-    dispute = Dispute(
-        contract_id=contract.id,
-        raised_by_id=current_user.id,
-        reason=payload.reason,
-        evidence_urls=payload.evidence_urls,
-        status=DisputeStatus.open,
+    # One statement: flip the contract to disputed (only for a party to it) and insert the dispute
+    # from the updated row, returning both. Postgres runs data-modifying CTEs atomically.
+    updated = (
+        update(Contract)
+        .where(
+            Contract.id == contract_id,
+            or_(Contract.buyer_id == current_user.id, Contract.seller_id == current_user.id),
+        )
+        .values(status=ContractStatus.disputed, updated_at=func.now())
+        .returning(*Contract.__table__.c)
+        .cte("updated_contract")
+    )
+    dispute_columns = Dispute.__table__.c
+    inserted = (
+        insert(Dispute)
+        .from_select(
+            ["contract_id", "raised_by_id", "reason", "evidence_urls", "status"],
+            select(
+                updated.c.id,
+                literal(current_user.id),
+                literal(payload.reason, dispute_columns.reason.type),
+                literal(payload.evidence_urls, dispute_columns.evidence_urls.type),
+                literal(DisputeStatus.open, dispute_columns.status.type),
+            ),
+        )
+        .returning(Dispute.id, Dispute.contract_id)
+        .cte("inserted_dispute")
+    )
+    contract_row = aliased(Contract, updated)
+    result = await db.execute(
+        select(contract_row, inserted.c.id.label("dispute_id"))
+        .join_from(contract_row, inserted, inserted.c.contract_id == contract_row.id)
+        .execution_options(populate_existing=True)
     )
-    contract.status = ContractStatus.disputed
-    db.add(dispute)
-    db.add(contract)
-    db.commit()
-    db.refresh(contract)
+    row = result.first()
+    if row is None:
+        await _load_contract_or_404(db, contract_id)
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a party to this contract")
+    contract, dispute_id = row
 
     log_action(
         db,
@@ -301,15 +546,21 @@ def raise_dispute(
         entity_id=contract.id,
         action="dispute_raised",
         actor_id=current_user.id,
-        payload={"status": contract.status.value, "dispute_id": dispute.id},
+        payload={"status": contract.status.value, "dispute_id": dispute_id},
     )
 
+    await db.commit()
+
     counterparty_id = contract.buyer_id if current_user.id == contract.seller_id else contract.seller_id
-    create_notification(
-        db,
-        user_id=counterparty_id,
-        notification_type="contract-disputed",
-        payload={"contract_id": contract.id, "dispute_id": dispute.id},
+    background.add_task(
+        deliver_notifications,
+        [
+            {
+                "user_id": counterparty_id,
+                "type": "contract-disputed",
+                "payload": {"contract_id": contract.id, "dispute_id": dispute_id},
+            }
+        ],
     )
 
     return _contract_to_response(contract, current_user)
\ No newline at end of file
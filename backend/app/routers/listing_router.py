@@ -1,11 +1,13 @@
+from datetime import datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+from pydantic import TypeAdapter
+from sqlalchemy import and_, bindparam, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, raiseload
 
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
 from app.models.contract import Contract, ContractStatus
 from app.models.listing import Listing, ListingStatus
 from app.schemas.listing import (
@@ -21,85 +23,125 @@ from app.utils.file_storage import save_upload_files
 from app.utils.security import get_current_user, require_role
 
 router = APIRouter()
-
-
-def _seller_alias(listing: Listing) -> str:
-    return f"Farmer #{listing.seller_id:03d}"
+# Validates a whole page of listings in one pydantic-core call instead of one model_validate per row.
+_listing_list_adapter = TypeAdapter(List[ListingResponse])
 
 
 def _serialize_listing(listing: Listing) -> ListingResponse:
-    data = jsonable_encoder(listing, exclude={"seller"})
-    data.update(
-        {
-            "seller_alias": _seller_alias(listing),
-            "photos": listing.photos or [],
-        }
+    # seller_alias and price_per_kg are hybrids on Listing, so everything is read straight off the row.
+    return ListingResponse.model_validate(listing)
+
+
+def _serialize_listing_detail(listing: Listing, summary: ListingOffersSummary) -> ListingDetailResponse:
+    detail = ListingDetailResponse.model_validate(listing)
+    detail.offers_summary = summary
+    return detail
+
+
+_latest_offer = aliased(Contract)
+# Offer counts and the newest offer's status are aggregated in SQL, so only three values cross the wire
+# no matter how many offers a listing has collected.
+_LISTING_DETAIL = (
+    select(
+        Listing,
+        func.count(Contract.id).label("total_offers"),
+        func.count(Contract.id).filter(Contract.status == ContractStatus.offered).label("active_offers"),
+        select(_latest_offer.status)
+        .where(_latest_offer.listing_id == Listing.id)
+        .order_by(_latest_offer.created_at.desc(), _latest_offer.id.desc())
+        .limit(1)
+        .scalar_subquery()
+        .label("last_offer_status"),
     )
-    return ListingResponse(**data)
-
-
-def _serialize_listing_detail(listing: Listing) -> ListingDetailResponse:
-    offers = listing.contracts or []
-    last_offer = None
-    if offers:
-        last_offer = max(
-            offers,
-            key=lambda contract: contract.created_at or contract.updated_at or listing.created_at,
-        )
-    summary = ListingOffersSummary(
-        total_offers=len(offers),
-        active_offers=sum(1 for offer in offers if offer.status == ContractStatus.offered),
-        last_offer_status=last_offer.status if last_offer else None,
-    )
-    base = _serialize_listing(listing).model_dump()
-    base.update({"offers_summary": summary})
-    return ListingDetailResponse(**base)
+    .options(raiseload("*"))
+    .outerjoin(Listing.contracts)
+    .where(Listing.id == bindparam("listing_id"))
+    .group_by(Listing.id)
+)
 
 
 @router.get("/", response_model=ListingListResponse)
-def list_listings(
+async def list_listings(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     commodity: Optional[str] = Query(default=None),
     min_qty: Optional[float] = Query(default=None, ge=0),
     max_price: Optional[float] = Query(default=None, ge=0),
     location: Optional[str] = Query(default=None),
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
+    after_ts: Optional[datetime] = Query(default=None),
+    after_id: Optional[int] = Query(default=None),
+    include_total: bool = Query(default=True),
 ) -> ListingListResponse:
-    query = db.query(Listing).options(joinedload(Listing.seller)).filter(Listing.status == ListingStatus.active)
-
+    """Active listings, newest first.
+
+    Pass the ``created_at`` and ``id`` of the last card received as
+    ``after_ts``/``after_id`` to keyset-paginate. Keyset pages, and numbered
+    pages requested with ``include_total=false``, skip the COUNT and report
+    ``total``/``pages`` as null. The marketplace pager needs both, so counting
+    stays the default.
+    """
+    filters = [Listing.status == ListingStatus.active]
     if commodity:
-        query = query.filter(func.lower(Listing.commodity) == commodity.lower())
+        filters.append(func.lower(Listing.commodity) == commodity.lower())
     if min_qty is not None:
-        query = query.filter(Listing.qty_kg >= min_qty)
+        filters.append(Listing.qty_kg >= min_qty)
     if max_price is not None:
-        query = query.filter(Listing.price_per_kg <= max_price)
+        filters.append(Listing.price_paise <= round(max_price * 100))
     if location:
-        query = query.filter(func.lower(Listing.location).like(f"%{location.lower()}%"))
-
-    total = query.count()
-    pages = max((total + limit - 1) // limit, 1)
-    if page > pages:
-        page = pages
-
-    listings = (
-        query.order_by(Listing.created_at.desc())
-        .offset((page - 1) * limit)
-        .limit(limit)
-        .all()
+        filters.append(Listing.location.ilike(f"%{location}%"))
+
+    # Cards only use listing columns; fail loudly rather than lazy-load a relationship per row.
+    query = (
+        select(Listing)
+        .options(raiseload("*"))
+        .where(*filters)
+        .order_by(Listing.created_at.desc(), Listing.id.desc())
     )
 
-    serialized = [_serialize_listing(listing) for listing in listings]
+    if after_ts is not None:
+        if after_id is None:
+            query = query.where(Listing.created_at < after_ts)
+        else:
+            query = query.where(
+                or_(
+                    Listing.created_at < after_ts,
+                    and_(Listing.created_at == after_ts, Listing.id < after_id),
+                )
+            )
+    elif include_total:
+        total = await db.scalar(select(func.count()).select_from(Listing).where(*filters))
+        pages = max((total + limit - 1) // limit, 1)
+        if page > pages:
+            page = pages
+
+        listings = await db.scalars(query.offset((page - 1) * limit).limit(limit))
+
+        serialized = _listing_list_adapter.validate_python(listings.all(), from_attributes=True)
+        meta = PaginationMeta(
+            total=total,
+            page=page,
+            limit=limit,
+            pages=pages,
+            has_next=page < pages,
+            has_prev=page > 1,
+        )
+        return ListingListResponse(listings=serialized, meta=meta)
+    else:
+        query = query.offset((page - 1) * limit)
+
+    # One extra row tells us whether another page exists without counting the rest.
+    listings = (await db.scalars(query.limit(limit + 1))).all()
     meta = PaginationMeta(
-        total=total,
         page=page,
         limit=limit,
-        pages=pages,
-        has_next=page < pages,
-        has_prev=page > 1,
+        has_next=len(listings) > limit,
+        has_prev=after_ts is not None or page > 1,
+    )
+    return ListingListResponse(
+        listings=_listing_list_adapter.validate_python(listings[:limit], from_attributes=True), meta=meta
     )
-    return ListingListResponse(listings=serialized, meta=meta)
 
 
 @router.post("/", response_model=ListingResponse, status_code=status.HTTP_201_CREATED)
@@ -143,8 +185,7 @@ def create_listing(
         listing.photos = saved
 
     db.add(listing)
-    db.commit()
-    db.refresh(listing)
+    db.flush()
 
     log_action(
         db,
@@ -154,23 +195,27 @@ def create_listing(
         actor_id=current_user.id,
         payload={"qty_kg": listing.qty_kg, "price_per_kg": listing.price_per_kg},
     )
+    db.commit()
 
     return _serialize_listing(listing)
 
 
 @router.get("/{listing_id}", response_model=ListingDetailResponse)
-def get_listing_detail(listing_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)) -> ListingDetailResponse:
-    listing = (
-        db.query(Listing)
-        .options(joinedload(Listing.contracts), joinedload(Listing.seller))
-        .filter(Listing.id == listing_id)
-        .first()
-    )
+async def get_listing_detail(
+    listing_id: int, db: AsyncSession = Depends(get_async_db), current_user=Depends(get_current_user)
+) -> ListingDetailResponse:
+    row = (await db.execute(_LISTING_DETAIL, {"listing_id": listing_id})).first()
 
-    if not listing:
+    if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Listing not found")
 
+    listing = row.Listing
     if listing.status != ListingStatus.active and listing.seller_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Listing unavailable")
 
-    return _serialize_listing_detail(listing)
\ No newline at end of file
+    summary = ListingOffersSummary(
+        total_offers=row.total_offers,
+        active_offers=row.active_offers,
+        last_offer_status=row.last_offer_status,
+    )
+    return _serialize_listing_detail(listing, summary)
@@ -1,9 +1,12 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
-from app.core.db import get_db
+from app.core.db import get_async_db
 from app.models.notification import Notification
 from app.schemas.notification import (
     NotificationListResponse,
@@ -13,28 +16,35 @@ from app.schemas.notification import (
 from app.utils.security import get_current_user
 
 router = APIRouter()
+_notification_list_adapter = TypeAdapter(List[NotificationResponse])
 
 
 @router.get("/", response_model=NotificationListResponse)
-def list_notifications(
+async def list_notifications(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
+    unread_only: bool = Query(default=False),
 ) -> NotificationListResponse:
-    query = db.query(Notification).filter(Notification.user_id == current_user.id)
+    filters = [Notification.user_id == current_user.id]
+    unread_filters = [*filters, Notification.read == False]
     
-    total_unread = query.filter(Notification.read == False).count()
+    total_unread = await db.scalar(
+        select(func.count()).select_from(Notification).where(*unread_filters)
+    )
     
-    notifications = (
-        query.order_by(Notification.created_at.desc())
+    notifications = await db.scalars(
+        select(Notification)
+        .options(raiseload("*"))
+        .where(*(unread_filters if unread_only else filters))
+        .order_by(Notification.created_at.desc())
         .offset((page - 1) * limit)
         .limit(limit)
-        .all()
     )
     
-    serialized = [NotificationResponse.model_validate(notif) for notif in notifications]
+    serialized = _notification_list_adapter.validate_python(notifications.all(), from_attributes=True)
     
     return NotificationListResponse(
         notifications=serialized,
@@ -43,27 +53,32 @@ def list_notifications(
 
 
 @router.post("/mark-read", status_code=status.HTTP_204_NO_CONTENT)
-def mark_notifications_read(
+async def mark_notifications_read(
     payload: NotificationMarkReadRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user),
 ):
     if not payload.notification_ids:
         return
     
-    updated = (
-        db.query(Notification)
-        .filter(
-            Notification.id.in_(payload.notification_ids),
-            Notification.user_id == current_user.id
+    # RETURNING reports exactly which of the requested ids belonged to the user and were flipped.
+    marked_ids = (
+        await db.scalars(
+            update(Notification)
+            .where(
+                Notification.id.in_(payload.notification_ids),
+                Notification.user_id == current_user.id
+            )
+            .values(read=True)
+            .returning(Notification.id)
+            .execution_options(synchronize_session=False)
         )
-        .update({"read": True}, synchronize_session=False)
-    )
+    ).all()
     
-    if updated == 0:
+    if not marked_ids:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No notifications found to mark as read"
         )
     
-    db.commit()
+    await db.commit()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, EmailStr, Field
 
 from app.schemas.user import UserResponse
@@ -7,7 +9,7 @@ class SignupRequest(BaseModel):
     name: str
     email: EmailStr
     password: str = Field(min_length=6)
-    role: str = Field(pattern="^(farmer|buyer)$")
+    role: Literal["farmer", "buyer"]
 
 
 class LoginRequest(BaseModel):
@@ -1,10 +1,13 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class PaginationMeta(BaseModel):
-    total: int
+    # total/pages are None for keyset (after_ts/after_id) pages, which skip the COUNT.
+    total: Optional[int] = None
     page: int
     limit: int
-    pages: int
+    pages: Optional[int] = None
     has_next: bool
     has_prev: bool
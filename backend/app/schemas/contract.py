@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationInfo, model_validator
 
 from app.models.contract import ContractStatus
 from app.schemas.base import ORMBase
@@ -12,7 +12,7 @@ class ContractEvent(BaseModel):
     actor_id: Optional[int]
     action: str
     timestamp: datetime
-    payload: dict = Field(default_factory=dict)
+    payload: Any = Field(default_factory=dict)
 
 
 class ContractResponse(ORMBase):
@@ -30,6 +30,19 @@ class ContractResponse(ORMBase):
     listing_ref: Optional[str] = None
     counterparty_name: Optional[str] = None
 
+    @model_validator(mode="after")
+    def _fill_display_fields(self, info: ValidationInfo) -> "ContractResponse":
+        # Pass context={"viewer_id": ...} to model_validate to label the other party for that user.
+        if self.listing_ref is None:
+            self.listing_ref = f"Listing #{self.listing_id:04d}"
+        viewer_id = (info.context or {}).get("viewer_id")
+        if self.counterparty_name is None and viewer_id is not None:
+            if viewer_id == self.buyer_id:
+                self.counterparty_name = f"Farmer #{self.seller_id:03d}"
+            elif viewer_id == self.seller_id:
+                self.counterparty_name = f"Buyer #{self.buyer_id:03d}"
+        return self
+
 
 class ContractDetailResponse(ContractResponse):
     timeline: List[ContractEvent]
@@ -39,6 +52,10 @@ class ContractListResponse(BaseModel):
     contracts: List[ContractResponse]
 
 
+class ContractStatsResponse(BaseModel):
+    counts: Dict[ContractStatus, int]
+
+
 class ContractCreateRequest(BaseModel):
     listing_id: int
     buyer_id: Optional[int] = None
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from app.models.contract import ContractStatus
 from app.models.listing import ListingStatus
@@ -31,9 +31,15 @@ class ListingResponse(ORMBase):
     created_at: datetime
     updated_at: datetime
 
+    @field_validator("photos", mode="before")
+    @classmethod
+    def _photos_default(cls, value):
+        return value or []
+
 
 class ListingDetailResponse(ListingResponse):
-    offers_summary: ListingOffersSummary
+    # Not a Listing attribute; the router fills it in after model_validate(listing).
+    offers_summary: ListingOffersSummary = Field(default_factory=ListingOffersSummary)
 
 
 class ListingListResponse(BaseModel):
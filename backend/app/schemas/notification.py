@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, List
 
 from pydantic import BaseModel
 
@@ -10,7 +10,8 @@ class NotificationResponse(ORMBase):
     id: int
     user_id: int
     type: str
-    payload: Dict[str, Any]
+    # Trusted JSONB straight from the row; passed through without per-key validation.
+    payload: Any
     read: bool
     created_at: datetime
 
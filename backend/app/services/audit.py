@@ -1,12 +1,14 @@
 from typing import Any, Optional
 
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.audit_log import AuditLog
 
 
 def log_action(
-    db: Session,
+    db: Session | AsyncSession,
     *,
     entity_type: str,
     entity_id: int,
@@ -14,6 +16,7 @@ def log_action(
     actor_id: Optional[int] = None,
     payload: Optional[dict[str, Any]] = None,
 ) -> AuditLog:
+    """Stage an audit row on the caller's session so it commits atomically with the change it records."""
     audit = AuditLog(
         entity_type=entity_type,
         entity_id=entity_id,
@@ -22,6 +25,23 @@ def log_action(
         payload=payload or {},
     )
     db.add(audit)
-    db.commit()
-    db.refresh(audit)
     return audit
+
+
+async def bulk_log_audit(db: AsyncSession, events: list[dict[str, Any]]) -> None:
+    """Insert many audit rows with a single executemany; like log_action, the caller commits."""
+    if not events:
+        return
+    await db.execute(
+        insert(AuditLog),
+        [
+            {
+                "entity_type": event["entity_type"],
+                "entity_id": event["entity_id"],
+                "action": event["action"],
+                "actor_id": event.get("actor_id"),
+                "payload": event.get("payload") or {},
+            }
+            for event in events
+        ],
+    )
@@ -1,19 +1,15 @@
-from typing import Any, Optional
+from typing import Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
 
+from app.core.db import AsyncSessionLocal
 from app.models.notification import Notification
 
 
-def create_notification(
-    db: Session,
-    *,
-    user_id: int,
-    notification_type: str,
-    payload: Optional[dict[str, Any]] = None,
-) -> Notification:
-    notification = Notification(user_id=user_id, type=notification_type, payload=payload or {})
-    db.add(notification)
-    db.commit()
-    db.refresh(notification)
-    return notification
+async def deliver_notifications(notifications: list[dict[str, Any]]) -> None:
+    """Persist notification rows on their own session; run via BackgroundTasks after the response is sent."""
+    if not notifications:
+        return
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Notification), notifications)
+        await db.commit()
@@ -1,3 +1,5 @@
+import re
+import shutil
 from pathlib import Path
 from typing import Iterable
 
@@ -7,6 +9,16 @@ from app.core.config import get_settings
 
 settings = get_settings()
 
+_COPY_CHUNK_BYTES = 1024 * 1024
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _safe_filename(filename: str) -> str:
+    # Keep only the final path component and a conservative character set, so client-supplied names
+    # can never walk out of the target directory.
+    name = _UNSAFE_FILENAME_CHARS.sub("_", Path(filename.replace("\\", "/")).name).lstrip(".")
+    return name or "upload"
+
 
 def ensure_media_root() -> Path:
     root = Path(settings.media_root)
@@ -23,10 +35,11 @@ def save_upload_files(files: Iterable[UploadFile], subdir: str) -> list[str]:
     for index, file in enumerate(files, start=1):
         if not file.filename:
             continue
-        safe_name = f"{index}_{file.filename.replace(' ', '_')}"
+        safe_name = f"{index}_{_safe_filename(file.filename)}"
         destination = target_dir / safe_name
+        # Copy in 1 MiB chunks so memory per upload stays bounded regardless of file size.
         with destination.open("wb") as buffer:
-            buffer.write(file.file.read())
+            shutil.copyfileobj(file.file, buffer, length=_COPY_CHUNK_BYTES)
         # build public path relative to mount, e.g. /media/subdir/... to serve statically
         relative_path = destination.relative_to(media_root)
         saved_paths.append(f"/media/{relative_path.as_posix()}")
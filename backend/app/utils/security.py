@@ -1,20 +1,44 @@
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Optional
 
+from cachetools import TLRUCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+import jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.config import get_settings
-from app.core.db import get_db
+from app.core.db import get_async_db
 from app.models.user import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Argon2id for new hashes; bare SHA-256 hex digests from the prototype still verify and are
+# flagged for re-hashing on the next successful login.
+pwd_context = CryptContext(
+    schemes=["argon2", "hex_sha256"],
+    deprecated=["hex_sha256"],
+    argon2__time_cost=2,
+    argon2__memory_cost=64 * 1024,
+    argon2__parallelism=2,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 settings = get_settings()
 
+_TOKEN_CACHE_TTL_SECONDS = 30
+# Token digest -> (user column snapshot, exp). Entries live at most 30s and never past the token's own
+# expiry, so a hot token skips jwt.decode and the users SELECT; role changes show up within the TTL.
+_token_cache: TLRUCache = TLRUCache(
+    maxsize=16384,
+    ttu=lambda _key, value, now: min(now + _TOKEN_CACHE_TTL_SECONDS, value[1]),
+    timer=time.time,
+)
+_token_cache_lock = threading.Lock()
+
 
 class TokenData:
     def __init__(self, user_id: int, role: str):
@@ -22,16 +46,13 @@ class TokenData:
         self.role = role
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    # For development, use simple SHA256 comparison
-    import hashlib
-    return hashlib.sha256(plain_password.encode()).hexdigest() == hashed_password
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash when the stored one uses a deprecated scheme."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    # For development, use simple SHA256 hash
-    import hashlib
-    return hashlib.sha256(password.encode()).hexdigest()
+    return pwd_context.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -42,7 +63,26 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+def _user_snapshot(user: User) -> dict[str, Any]:
+    state = inspect(user)
+    return {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs if attr.key in state.dict}
+
+
+async def _user_from_snapshot(db: AsyncSession, snapshot: dict[str, Any]) -> User:
+    # A fresh detached copy per request, attached to this request's session without a SELECT. Deferred
+    # columns such as profile_data are not loaded; an AsyncSession cannot lazy-load them, so query explicitly.
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)) -> User:
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+    if cached is not None:
+        return await _user_from_snapshot(db, cached[0])
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -50,7 +90,12 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
     )
 
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        payload = jwt.decode(
+            token,
+            settings.secret_key,
+            algorithms=[settings.algorithm],
+            options={"require": ["exp", "sub", "role"]},
+        )
         user_id_str: str = payload.get("sub")
         role: str = payload.get("role")
         if user_id_str is None or role is None:
@@ -63,17 +108,19 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
             raise credentials_exception
             
         token_data = TokenData(user_id=user_id, role=role)
-    except JWTError as exc:
+    except jwt.InvalidTokenError as exc:
         raise credentials_exception from exc
 
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = await db.get(User, token_data.user_id)
     if user is None:
         raise credentials_exception
+    with _token_cache_lock:
+        _token_cache[cache_key] = (_user_snapshot(user), payload["exp"])
     return user
 
 
 def require_role(*roles: str):
-    def role_checker(user: User = Depends(get_current_user)) -> User:
+    async def role_checker(user: User = Depends(get_current_user)) -> User:
         if user.role not in roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
         return user
@@ -0,0 +1,20 @@
+"""Gunicorn settings for running the API under uvicorn workers.
+
+``preload_app`` imports ``app.main`` once in the master, so the dev-only ``create_all`` and
+all model/schema construction happen a single time and are shared copy-on-write with workers.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Connections opened in the master must not be shared across forked workers.
+    from app.core.db import async_engine, engine
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
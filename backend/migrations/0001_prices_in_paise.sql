@@ -0,0 +1,28 @@
+-- Store listing and contract prices as integer paise (BIGINT) instead of rupee floats/numerics.
+-- Safe to re-run: each table is converted only while it still has its old rupee column, so databases
+-- created by create_all after this change are left alone.
+BEGIN;
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'contracts' AND column_name = 'offer_price_per_kg'
+    ) THEN
+        ALTER TABLE contracts ADD COLUMN offer_price_paise BIGINT;
+        UPDATE contracts SET offer_price_paise = round(offer_price_per_kg * 100);
+        ALTER TABLE contracts ALTER COLUMN offer_price_paise SET NOT NULL, DROP COLUMN offer_price_per_kg;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'listings' AND column_name = 'price_per_kg'
+    ) THEN
+        ALTER TABLE listings ADD COLUMN price_paise BIGINT;
+        UPDATE listings SET price_paise = round(price_per_kg * 100);
+        ALTER TABLE listings ALTER COLUMN price_paise SET NOT NULL, DROP COLUMN price_per_kg;
+    END IF;
+END
+$$;
+
+COMMIT;
@@ -0,0 +1,28 @@
+-- One price per commodity per day: the unique constraint the price feed upsert uses as its ON CONFLICT target.
+-- Safe to re-run: duplicates are collapsed first and the constraint is only added when missing.
+BEGIN;
+
+-- Keep feed writes out while duplicates are collapsed and the constraint is built.
+LOCK TABLE price_history IN SHARE ROW EXCLUSIVE MODE;
+
+-- Keep the most recently written row for each (commodity, recorded_on).
+DELETE FROM price_history AS older
+USING price_history AS newer
+WHERE newer.commodity = older.commodity
+  AND newer.recorded_on = older.recorded_on
+  AND newer.id > older.id;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'uq_price_history_commodity_recorded_on'
+          AND conrelid = 'price_history'::regclass
+    ) THEN
+        ALTER TABLE price_history
+            ADD CONSTRAINT uq_price_history_commodity_recorded_on UNIQUE (commodity, recorded_on);
+    END IF;
+END
+$$;
+
+COMMIT;
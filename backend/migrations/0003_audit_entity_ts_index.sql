@@ -0,0 +1,6 @@
+-- Composite index for the contract timeline and admin audit view: filter on (entity_type, entity_id),
+-- return rows in timestamp order without a sort.
+-- CONCURRENTLY cannot run inside a transaction, so this script has no BEGIN/COMMIT; run it with plain psql -f.
+-- If a concurrent build is interrupted it leaves an INVALID index that IF NOT EXISTS will skip:
+-- DROP INDEX CONCURRENTLY ix_audit_entity_ts and re-run.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_audit_entity_ts ON audit_logs (entity_type, entity_id, timestamp);
@@ -0,0 +1,8 @@
+-- "My contracts" filters on either party and sorts newest first: index each party with created_at, then drop
+-- the single-column party indexes, which are now redundant prefixes of the composite ones.
+-- CONCURRENTLY cannot run inside a transaction, so this script has no BEGIN/COMMIT; run it with plain psql -f.
+-- The new indexes are built before the old ones go, so party lookups stay indexed throughout.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contracts_buyer_created ON contracts (buyer_id, created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_contracts_seller_created ON contracts (seller_id, created_at);
+DROP INDEX CONCURRENTLY IF EXISTS ix_contracts_buyer_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_contracts_seller_id;
@@ -0,0 +1,14 @@
+-- Indexes shaped to the marketplace and notification feeds' filters and sort order.
+-- CONCURRENTLY cannot run inside a transaction, so this script has no BEGIN/COMMIT; run it with plain psql -f.
+
+-- Marketplace feed: active listings only, newest first with id as the keyset tiebreak.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_listings_active_created
+    ON listings (created_at, id) WHERE status = 'active';
+-- Commodity filter compares lower(commodity).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_listings_active_commodity
+    ON listings (lower(commodity), created_at) WHERE status = 'active';
+
+-- Full notification feed: user_id equality then newest first. It makes the standalone user_id index a
+-- redundant prefix, which is dropped once the composite index exists.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notif_user_created ON notifications (user_id, created_at);
+DROP INDEX CONCURRENTLY IF EXISTS ix_notifications_user_id;
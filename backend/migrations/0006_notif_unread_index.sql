@@ -0,0 +1,5 @@
+-- Unread notifications are a small, hot subset: this partial index serves the unread count and the
+-- unread-only feed without touching read rows.
+-- CONCURRENTLY cannot run inside a transaction, so this script has no BEGIN/COMMIT; run it with plain psql -f.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notif_unread
+    ON notifications (user_id, created_at) WHERE read = false;
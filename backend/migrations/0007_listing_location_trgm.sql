@@ -0,0 +1,6 @@
+-- Trigram GIN index so the listing location search (ILIKE '%...%') can use an index despite the leading %.
+-- pg_trgm is a trusted extension on PostgreSQL 13+, so the database owner can create it without superuser.
+-- CONCURRENTLY cannot run inside a transaction, so this script has no BEGIN/COMMIT; run it with plain psql -f.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_listings_location_trgm
+    ON listings USING gin (location gin_trgm_ops);
@@ -0,0 +1,29 @@
+-- Store audit, dispute and notification payloads as jsonb instead of json text.
+-- Safe to re-run: a column is converted only while it is still json. Each ALTER rewrites its table under an
+-- exclusive lock, so run this outside peak traffic on large audit_logs/notifications tables.
+BEGIN;
+
+DO $$
+DECLARE
+    target record;
+BEGIN
+    FOR target IN
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND data_type = 'json'
+          AND (table_name, column_name) IN (
+              ('audit_logs', 'payload'),
+              ('disputes', 'evidence_urls'),
+              ('notifications', 'payload')
+          )
+    LOOP
+        EXECUTE format(
+            'ALTER TABLE %I ALTER COLUMN %I TYPE jsonb USING %I::jsonb',
+            target.table_name, target.column_name, target.column_name
+        );
+    END LOOP;
+END
+$$;
+
+COMMIT;
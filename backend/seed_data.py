@@ -4,14 +4,16 @@ Seed script for the oilseed hedging platform.
 Creates sample users, listings, contracts, and price history data.
 """
 
+import csv
+import io
 import os
 import sys
 from datetime import date, datetime, timedelta
-from decimal import Decimal
 
 # Add the app directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "app"))
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.core.db import SessionLocal, engine
@@ -25,7 +27,23 @@ from app.models import (
     PriceHistory,
     User,
 )
-import hashlib
+from app.utils.security import get_password_hash
+
+# Every seed user shares this password, so it is hashed (argon2) once rather than per user.
+SEED_PASSWORD_HASH = get_password_hash("password123")
+_PRICE_HISTORY_COPY_SQL = "COPY price_history (commodity, price_per_kg, recorded_on) FROM STDIN WITH (FORMAT csv)"
+
+
+def _copy_price_history(db: Session, rows: list[dict]) -> None:
+    """Stream price history rows with COPY, for seeding large histories on psycopg2."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        (row["commodity"], row["price_per_kg"], row["recorded_on"].isoformat()) for row in rows
+    )
+    buffer.seek(0)
+    # Same DBAPI connection the session's transaction is on, so the rows commit with the rest of the seed.
+    with db.connection().connection.cursor() as cursor:
+        cursor.copy_expert(_PRICE_HISTORY_COPY_SQL, buffer)
 
 
 def create_seed_data():
@@ -53,23 +71,28 @@ def create_seed_data():
             {"name": "Export House", "email": "trade@exporthouse.com", "role": "buyer"},
         ]
         
-        users = []
+        # Each table goes in as one executemany INSERT; RETURNING (in parameter order) hands back the
+        # generated ids the next table needs without a flush per row.
+        user_rows = []
         for user_data in users_data:
-            # Simple hash for seed data - in production, use proper bcrypt
-            password_hash = hashlib.sha256("password123".encode()).hexdigest()
-            user = User(
-                name=user_data["name"],
-                email=user_data["email"],
-                password_hash=password_hash,
-                role=user_data["role"],
-                kyc_status="approved" if user_data["role"] == "buyer" else "pending",
+            user_rows.append(
+                {
+                    "name": user_data["name"],
+                    "email": user_data["email"],
+                    "password_hash": SEED_PASSWORD_HASH,
+                    "role": user_data["role"],
+                    "kyc_status": "approved" if user_data["role"] == "buyer" else "pending",
+                }
             )
-            db.add(user)
-            users.append(user)
-        
-        db.commit()
-        print(f"✅ Created {len(users)} users")
-        
+
+        user_ids = {
+            email: user_id
+            for user_id, email in db.execute(
+                insert(User).returning(User.id, User.email, sort_by_parameter_order=True), user_rows
+            )
+        }
+        print(f"✅ Created {len(user_ids)} users")
+
         # Create sample listings
         commodities = ["soymeal", "groundnut", "mustard", "sunflower"]
         listings_data = [
@@ -82,146 +105,141 @@ def create_seed_data():
             {"commodity": "mustard", "variety": "Pusa Bold", "qty_kg": 3500, "price_per_kg": 58.50, "moisture_pct": 8.5, "location": "Haryana", "seller_idx": 0},
             {"commodity": "sunflower", "variety": "DRSH-1", "qty_kg": 1800, "price_per_kg": 44.75, "moisture_pct": 8.0, "location": "Andhra Pradesh", "seller_idx": 1},
         ]
-        
-        farmers = [u for u in users if u.role == "farmer"]
-        listings = []
-        
-        for listing_data in listings_data:
-            listing = Listing(
-                seller_id=farmers[listing_data["seller_idx"]].id,
-                commodity=listing_data["commodity"],
-                variety=listing_data["variety"],
-                qty_kg=listing_data["qty_kg"],
-                price_per_kg=listing_data["price_per_kg"],
-                moisture_pct=listing_data["moisture_pct"],
-                quality_notes=f"High quality {listing_data['commodity']} from {listing_data['location']}",
-                location=listing_data["location"],
-                status=ListingStatus.active,
-                photos=[],
-            )
-            db.add(listing)
-            listings.append(listing)
-        
-        db.commit()
+
+        farmer_ids = [user_ids[u["email"]] for u in users_data if u["role"] == "farmer"]
+        listing_rows = [
+            {
+                "seller_id": farmer_ids[listing_data["seller_idx"]],
+                "commodity": listing_data["commodity"],
+                "variety": listing_data["variety"],
+                "qty_kg": listing_data["qty_kg"],
+                "price_paise": round(listing_data["price_per_kg"] * 100),
+                "moisture_pct": listing_data["moisture_pct"],
+                "quality_notes": f"High quality {listing_data['commodity']} from {listing_data['location']}",
+                "location": listing_data["location"],
+                "status": ListingStatus.active,
+                "photos": [],
+            }
+            for listing_data in listings_data
+        ]
+
+        listings = db.execute(
+            insert(Listing).returning(Listing.id, Listing.seller_id, sort_by_parameter_order=True), listing_rows
+        ).all()
         print(f"✅ Created {len(listings)} listings")
-        
+
         # Create sample contracts (offers)
-        buyers = [u for u in users if u.role == "buyer"]
+        buyer_ids = [user_ids[u["email"]] for u in users_data if u["role"] == "buyer"]
         contracts_data = [
-            {"listing_idx": 0, "buyer_idx": 0, "qty_kg": 2000, "offer_price": 46.00, "status": "OFFERED"},
-            {"listing_idx": 1, "buyer_idx": 1, "qty_kg": 1500, "offer_price": 87.50, "status": "ACCEPTED"},
-            {"listing_idx": 2, "buyer_idx": 2, "qty_kg": 2500, "offer_price": 56.00, "status": "COMPLETED"},
+            {"listing_idx": 0, "buyer_idx": 0, "qty_kg": 2000, "offer_price": 46.00, "status": ContractStatus.offered},
+            {"listing_idx": 1, "buyer_idx": 1, "qty_kg": 1500, "offer_price": 87.50, "status": ContractStatus.accepted},
+            {"listing_idx": 2, "buyer_idx": 2, "qty_kg": 2500, "offer_price": 56.00, "status": ContractStatus.completed},
         ]
-        
-        contracts = []
+
+        expiry_date = datetime.utcnow() + timedelta(days=30)
+        contract_rows = []
         for contract_data in contracts_data:
             listing = listings[contract_data["listing_idx"]]
-            buyer = buyers[contract_data["buyer_idx"]]
-            
-            contract = Contract(
-                listing_id=listing.id,
-                buyer_id=buyer.id,
-                seller_id=listing.seller_id,
-                qty_kg=contract_data["qty_kg"],
-                offer_price_per_kg=Decimal(str(contract_data["offer_price"])),
-                status=contract_data["status"],
-                expiry_date=datetime.utcnow() + timedelta(days=30),
+            contract_rows.append(
+                {
+                    "listing_id": listing.id,
+                    "buyer_id": buyer_ids[contract_data["buyer_idx"]],
+                    "seller_id": listing.seller_id,
+                    "qty_kg": contract_data["qty_kg"],
+                    "offer_price_paise": round(contract_data["offer_price"] * 100),
+                    "status": contract_data["status"],
+                    "expiry_date": expiry_date,
+                }
             )
-            db.add(contract)
-            contracts.append(contract)
-        
-        db.commit()
+
+        contracts = db.execute(
+            insert(Contract).returning(
+                Contract.id,
+                Contract.buyer_id,
+                Contract.seller_id,
+                Contract.status,
+                Contract.qty_kg,
+                sort_by_parameter_order=True,
+            ),
+            contract_rows,
+        ).all()
         print(f"✅ Created {len(contracts)} contracts")
-        
+
         # Create price history for charts
         base_date = date.today() - timedelta(days=30)
-        price_history_data = []
-        
+
         base_prices = {
             "soymeal": 44.0,
             "groundnut": 82.0,
             "mustard": 54.0,
             "sunflower": 41.0,
         }
-        
-        for i in range(31):  # Last 30 days + today
-            current_date = base_date + timedelta(days=i)
-            for commodity, base_price in base_prices.items():
-                # Add some realistic price variation
-                variation = (i % 7 - 3) * 0.5  # ±1.5 price variation
-                price = base_price + variation + (i * 0.1)  # Slight upward trend
-                
-                price_record = PriceHistory(
-                    commodity=commodity,
-                    price_per_kg=round(price, 2),
-                    recorded_on=current_date,
-                )
-                db.add(price_record)
-                price_history_data.append(price_record)
-        
-        db.commit()
-        print(f"✅ Created {len(price_history_data)} price history records")
-        
+
+        history_dates = [base_date + timedelta(days=i) for i in range(31)]  # Last 30 days + today
+        # The weekly ±1.5 swing plus a slight upward trend depend only on the day, not the commodity.
+        day_offsets = [(i % 7 - 3) * 0.5 + i * 0.1 for i in range(len(history_dates))]
+        price_history_rows = [
+            {"commodity": commodity, "price_per_kg": round(base_price + offset, 2), "recorded_on": current_date}
+            for current_date, offset in zip(history_dates, day_offsets)
+            for commodity, base_price in base_prices.items()
+        ]
+
+        if db.get_bind().dialect.driver == "psycopg2":
+            _copy_price_history(db, price_history_rows)
+        else:
+            db.execute(insert(PriceHistory), price_history_rows)
+        print(f"✅ Created {len(price_history_rows)} price history records")
+
         # Create sample notifications
-        notifications_data = [
-            {"user_id": farmers[0].id, "type": "offer-created", "payload": {"contract_id": contracts[0].id, "listing_id": listings[0].id}},
-            {"user_id": buyers[1].id, "type": "offer-accepted", "payload": {"contract_id": contracts[1].id}},
-            {"user_id": buyers[2].id, "type": "contract-completed", "payload": {"contract_id": contracts[2].id}},
+        notification_rows = [
+            {"user_id": farmer_ids[0], "type": "offer-created", "payload": {"contract_id": contracts[0].id, "listing_id": listings[0].id}, "read": False},
+            {"user_id": buyer_ids[1], "type": "offer-accepted", "payload": {"contract_id": contracts[1].id}, "read": False},
+            {"user_id": buyer_ids[2], "type": "contract-completed", "payload": {"contract_id": contracts[2].id}, "read": False},
         ]
-        
-        notifications = []
-        for notif_data in notifications_data:
-            notification = Notification(
-                user_id=notif_data["user_id"],
-                type=notif_data["type"],
-                payload=notif_data["payload"],
-                read=False,
-            )
-            db.add(notification)
-            notifications.append(notification)
-        
-        db.commit()
-        print(f"✅ Created {len(notifications)} notifications")
-        
+
+        db.execute(insert(Notification), notification_rows)
+        print(f"✅ Created {len(notification_rows)} notifications")
+
         # Create audit logs for contracts
-        audit_logs = []
-        for i, contract in enumerate(contracts):
+        audit_log_rows = []
+        for contract in contracts:
             # Create audit log for contract creation
-            audit_log = AuditLog(
-                entity_type="contract",
-                entity_id=contract.id,
-                action="offer_created",
-                actor_id=contract.buyer_id,
-                payload={"status": contract.status, "qty_kg": contract.qty_kg},
+            audit_log_rows.append(
+                {
+                    "entity_type": "contract",
+                    "entity_id": contract.id,
+                    "action": "offer_created",
+                    "actor_id": contract.buyer_id,
+                    "payload": {"status": contract.status, "qty_kg": contract.qty_kg},
+                }
             )
-            db.add(audit_log)
-            audit_logs.append(audit_log)
-            
+
             # Add additional logs for accepted/completed contracts
-            if contract.status in ["ACCEPTED", "COMPLETED"]:
-                accept_log = AuditLog(
-                    entity_type="contract",
-                    entity_id=contract.id,
-                    action="offer_accepted",
-                    actor_id=contract.seller_id,
-                    payload={"status": "ACCEPTED"},
+            if contract.status in [ContractStatus.accepted, ContractStatus.completed]:
+                audit_log_rows.append(
+                    {
+                        "entity_type": "contract",
+                        "entity_id": contract.id,
+                        "action": "offer_accepted",
+                        "actor_id": contract.seller_id,
+                        "payload": {"status": ContractStatus.accepted},
+                    }
                 )
-                db.add(accept_log)
-                audit_logs.append(accept_log)
-            
-            if contract.status == "COMPLETED":
-                complete_log = AuditLog(
-                    entity_type="contract",
-                    entity_id=contract.id,
-                    action="delivery_confirmed",
-                    actor_id=contract.seller_id,
-                    payload={"status": "COMPLETED"},
+
+            if contract.status == ContractStatus.completed:
+                audit_log_rows.append(
+                    {
+                        "entity_type": "contract",
+                        "entity_id": contract.id,
+                        "action": "delivery_confirmed",
+                        "actor_id": contract.seller_id,
+                        "payload": {"status": ContractStatus.completed},
+                    }
                 )
-                db.add(complete_log)
-                audit_logs.append(complete_log)
-        
+
+        db.execute(insert(AuditLog), audit_log_rows)
         db.commit()
-        print(f"✅ Created {len(audit_logs)} audit log entries")
+        print(f"✅ Created {len(audit_log_rows)} audit log entries")
         
         print("\n🎉 Seed data creation completed successfully!")
         print("\nSample login credentials:")